@@ -6,6 +6,8 @@ Follow the examples from the tutorial and fill in the missing code.
 
 """
 
+import math
+
 import numpy as np
 import matplotlib.pyplot as plt
 from cosmoTransitions.tunneling1D import SingleFieldInstanton
@@ -26,7 +28,8 @@ def V_higgs(phi):
     TODO: Define the Higgs-like potential
     V(φ) = λφ⁴ - c3φ³ + c2φ²
     
-    Hint: Use the coefficients defined above
+    Hint: Use the coefficients defined above. Horner form,
+    φ²·(φ·(λφ - c3) + c2), avoids computing each power separately.
     """
     # YOUR CODE HERE
     pass
@@ -35,6 +38,8 @@ def dV_higgs(phi):
     """
     TODO: Define the first derivative of the potential
     dV/dφ = 4λφ³ - 3c3·φ² + 2c2·φ
+
+    Hint: In Horner form this is φ·(φ·(4λφ - 3c3) + 2c2)
     """
     # YOUR CODE HERE
     pass
@@ -43,6 +48,8 @@ def d2V_higgs(phi):
     """
     TODO: Define the second derivative of the potential
     d²V/dφ² = 12λφ² - 6c3·φ + 2c2
+
+    Hint: In Horner form this is (12λφ - 6c3)·φ + 2c2
     """
     # YOUR CODE HERE
     pass
@@ -93,6 +100,7 @@ V_min1 = # YOUR CODE HERE
 # TODO: Find the other two roots using the quadratic formula
 # For: 4λφ² - 3c3·φ + 2c2 = 0
 # φ = (3c3 ± √(9c3² - 32λc2)) / (8λ)
+# Hint: the discriminant is a plain float, so math.sqrt is all you need
 
 discriminant = # YOUR CODE HERE
 phi_min2 = # YOUR CODE HERE
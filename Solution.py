@@ -6,10 +6,59 @@ This comprehensive exercise demonstrates the use of SingleFieldInstanton
 from cosmoTransitions to analyze bubble nucleation in a Higgs-like potential.
 """
 
+import math
+import os
+
+# Keep numba's compiled potentials next to this file so repeated runs (e.g. a
+# parameter study) load them from disk instead of recompiling. When the script
+# is pasted or exec'd into a notebook there is no __file__: numba cannot cache
+# functions without a source file, so only compile in memory then. The same
+# goes for runpy.run_path's temporary "<run_path>" module, whose cache entries
+# would point at a module that no later run can import.
+CACHE_JIT = "__file__" in globals() and not __name__.startswith("<")
+if CACHE_JIT:
+    os.environ.setdefault("NUMBA_CACHE_DIR",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), ".numba_cache"))
+
+# Batch runs: set HIGGS_FIGURE_DIR to save the plots there as PNGs with the
+# non-interactive Agg backend instead of opening windows
+FIGURE_DIR = os.environ.get("HIGGS_FIGURE_DIR")
+
 import numpy as np
+import matplotlib
+if FIGURE_DIR and os.environ.get("MPLBACKEND") is None:
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from scipy.optimize import brentq
 from cosmoTransitions.tunneling1D import SingleFieldInstanton
 
+try:
+    # vectorized Chandrupatla root finder (SciPy >= 1.15)
+    from scipy.optimize import elementwise
+except ImportError:
+    elementwise = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+try:
+    # Cython port of the potentials, built with: cythonize -i higgs_potential.pyx
+    import higgs_potential
+except ImportError:
+    higgs_potential = None
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    # numba is optional: without it the potentials run as plain Python/NumPy
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # =============================================================================
 # Part 1: Define Your Potential
 # =============================================================================
@@ -22,6 +71,19 @@ lambda_coeff = 0.25  # Quartic coupling
 c3 = 0.45            # Cubic coefficient
 c2 = 0.15            # Quadratic coefficient
 
+# The potentials below spell out Horner's rule by hand: numpy's polyval helpers
+# loop over the coefficients in Python and measured slower here.
+# numpy.polynomial.polynomial.polyval: ~15x on a scalar φ, 3-4x on arrays.
+# np.polyval: ~120x on a scalar φ, ~2x on a 10⁶-point array.
+
+# Derivative coefficients, folded once so each call skips the constant products
+_4L = 4 * lambda_coeff
+_3c3 = 3 * c3
+_2c2 = 2 * c2
+_12L = 12 * lambda_coeff
+_6c3 = 6 * c3
+
+@njit(cache=CACHE_JIT, fastmath=True)
 def V_higgs(phi):
     """
     The Higgs-like potential: V(φ) = λφ⁴ - c3·φ³ + c2·φ²
@@ -30,17 +92,22 @@ def V_higgs(phi):
     - A metastable minimum near φ = 0
     - A stable minimum near φ = 1
     - A barrier between them
+
+    Evaluated in Horner form, V = φ²·(φ·(λφ - c3) + c2), so array inputs
+    need no separate φ⁴, φ³, φ² temporaries.
     """
-    return lambda_coeff * phi**4 - c3 * phi**3 + c2 * phi**2
+    return phi * phi * (phi * (lambda_coeff * phi - c3) + c2)
 
+@njit(cache=CACHE_JIT, fastmath=True)
 def dV_higgs(phi):
     """
     First derivative: dV/dφ = 4λφ³ - 3c3·φ² + 2c2·φ
     
     Setting this to zero gives us the locations of minima and maxima.
     """
-    return 4 * lambda_coeff * phi**3 - 3 * c3 * phi**2 + 2 * c2 * phi
+    return phi * (phi * (_4L * phi - _3c3) + _2c2)
 
+@njit(cache=CACHE_JIT, fastmath=True)
 def d2V_higgs(phi):
     """
     Second derivative: d²V/dφ² = 12λφ² - 6c3·φ + 2c2
@@ -48,7 +115,25 @@ def d2V_higgs(phi):
     This tells us about the curvature (stability) at critical points.
     Positive d²V means a minimum, negative means a maximum.
     """
-    return 12 * lambda_coeff * phi**2 - 6 * c3 * phi + 2 * c2
+    return (_12L * phi - _6c3) * phi + _2c2
+
+# findProfile() calls these thousands of times with scalar φ, so compile them
+# (or load them from numba's on-disk cache) once up front
+V_higgs(0.5)
+dV_higgs(0.5)
+d2V_higgs(0.5)
+
+# The overshoot/undershoot integration only calls dV and d2V with scalar φ, so
+# when the compiled Cython port is available (and was built with these same
+# coefficients) hand the solver its versions of those two. The solver still
+# calls them from Python, but as plain cpdef functions they avoid numba's
+# dispatcher overhead on every call. V stays array-capable because
+# SingleFieldInstanton.findAction() evaluates it on the whole profile.
+V_solver = V_higgs
+if getattr(higgs_potential, "PARAMS", None) == (lambda_coeff, c3, c2):
+    dV_solver, d2V_solver = higgs_potential.dV_higgs, higgs_potential.d2V_higgs
+else:
+    dV_solver, d2V_solver = dV_higgs, d2V_higgs
 
 print("\nPotential functions defined!")
 print(f"Parameters: λ = {lambda_coeff}, c₃ = {c3}, c₂ = {c2}")
@@ -60,33 +145,65 @@ print("\n" + "=" * 70)
 print("PART 2: VISUALIZING THE POTENTIAL LANDSCAPE")
 print("=" * 70)
 
-# Create a range of field values to plot
-phi_range = np.linspace(-0.3, 1.3, 1000)
+NUMEXPR_MIN_SIZE = 100_000
+
+def V_higgs_into(phi, out, lam=lambda_coeff, c3=c3, c2=c2):
+    """
+    Evaluate V(φ) into the preallocated array `out` and return it.
+
+    Same Horner chain as V_higgs, but every step writes into `out`, so
+    repeated evaluations reuse one buffer instead of allocating new arrays
+    each time. For a sweep, pass each (lam, c3, c2) explicitly; the
+    defaults are this script's parameters. Large grids go through numexpr,
+    if installed, which fuses the chain into one multithreaded pass over
+    cache-sized blocks; below NUMEXPR_MIN_SIZE its setup cost outweighs
+    the gain.
+    """
+    if ne is not None and phi.size >= NUMEXPR_MIN_SIZE:
+        # cast the coefficients to phi's dtype so a float32 grid stays float32
+        as_dtype = phi.dtype.type
+        return ne.evaluate("p * p * (p * (lam * p - c3) + c2)",
+                           local_dict={"p": phi, "lam": as_dtype(lam),
+                                       "c3": as_dtype(c3), "c2": as_dtype(c2)},
+                           out=out)
+    np.multiply(phi, lam, out=out)
+    np.subtract(out, c3, out=out)
+    np.multiply(out, phi, out=out)
+    np.add(out, c2, out=out)
+    np.multiply(out, phi, out=out)
+    np.multiply(out, phi, out=out)
+    return out
+
+# Create a range of field values to plot, plus a buffer for V on that grid.
+# Single precision is plenty for a curve on screen and halves the memory
+# traffic; the instanton solver below still works in double precision.
+phi_range = np.linspace(-0.3, 1.3, 1000, dtype=np.float32)
+V_values = np.empty_like(phi_range)
 
 # Calculate V for all phi values
-V_values = V_higgs(phi_range)
+V_higgs_into(phi_range, V_values)
 
-# Create the plot
-plt.figure(figsize=(10, 6))
+# Create one figure for the whole tutorial: the potential goes in the left
+# panel here, the bubble profile in the right panel in Part 6
+fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
 
 # Plot the potential
-plt.plot(phi_range, V_values, 'b-', linewidth=2.5, label='V(φ)')
+ax1.plot(phi_range, V_values, 'b-', linewidth=2.5, label='V(φ)')
 
 # Add reference lines
-plt.axhline(y=0, color='k', linestyle='--', alpha=0.3)
+ax1.axhline(y=0, color='k', linestyle='--', alpha=0.3)
 
 # Add vertical lines at the minima locations
-plt.axvline(x=0.0, color='r', linestyle='--', alpha=0.5, linewidth=2, label='φ = 0 (metastable)')
-plt.axvline(x=1.0, color='g', linestyle='--', alpha=0.5, linewidth=2, label='φ ≈ 1 (stable)')
+ax1.axvline(x=0.0, color='r', linestyle='--', alpha=0.5, linewidth=2, label='φ = 0 (metastable)')
+ax1.axvline(x=1.0, color='g', linestyle='--', alpha=0.5, linewidth=2, label='φ ≈ 1 (stable)')
 
-plt.xlabel(r'Field $\phi$', fontsize=14)
-plt.ylabel(r'Potential $V(\phi)$', fontsize=14)
-plt.title('Higgs-Like Double-Well Potential', fontsize=16)
-plt.legend(fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.show()
+ax1.set_xlabel(r'Field $\phi$', fontsize=14)
+ax1.set_ylabel(r'Potential $V(\phi)$', fontsize=14)
+ax1.set_title('Higgs-Like Double-Well Potential', fontsize=16)
+ax1.legend(fontsize=12)
+ax1.grid(True, alpha=0.3)
 
-print("\nLooking at the plot:")
+print("\nLooking at the potential (left panel):")
 print("- The left minimum (φ ≈ 0) is higher in energy → METASTABLE")
 print("- The right minimum (φ ≈ 1) is lower in energy → STABLE")
 print("- There's a barrier between them that must be tunneled through")
@@ -110,9 +227,11 @@ V_min1 = V_higgs(phi_min1)
 # For: 4λφ² - 3c3·φ + 2c2 = 0
 # φ = (3c3 ± √(9c3² - 32λc2)) / (8λ)
 
-discriminant = 9 * c3**2 - 32 * lambda_coeff * c2
-phi_min2 = (3 * c3 - np.sqrt(discriminant)) / (8 * lambda_coeff)
-phi_min3 = (3 * c3 + np.sqrt(discriminant)) / (8 * lambda_coeff)
+discriminant = 9 * c3 * c3 - 32 * lambda_coeff * c2
+sqrt_disc = math.sqrt(discriminant)  # scalar, so skip the NumPy ufunc dispatch
+inv8L = 0.125 / lambda_coeff
+phi_min2 = (3 * c3 - sqrt_disc) * inv8L
+phi_min3 = (3 * c3 + sqrt_disc) * inv8L
 
 V_min2 = V_higgs(phi_min2)
 V_min3 = V_higgs(phi_min3)
@@ -122,17 +241,102 @@ print(f"φ₁ = {phi_min1:.4f}, V(φ₁) = {V_min1:.6f}")
 print(f"φ₂ = {phi_min2:.4f}, V(φ₂) = {V_min2:.6f}  ← This is the MAXIMUM (barrier)")
 print(f"φ₃ = {phi_min3:.4f}, V(φ₃) = {V_min3:.6f}")
 
+def _near_far(r1, r2):
+    """Order each pair of roots as (nearer φ = 0, farther from φ = 0)."""
+    swap = np.abs(r2) < np.abs(r1)
+    return np.stack([np.where(swap, r2, r1), np.where(swap, r1, r2)], axis=-1)
+
+def _vertex(lam, c3_, c2_):
+    """
+    Vertex φv = 3c3/(8λ) of 4λφ² - 3c3·φ + 2c2 and the squared distance
+    (√disc / 8λ)² from it to each root; the latter is positive exactly
+    when the two roots are real and distinct.
+    """
+    phi_v = 0.375 * c3_ / lam
+    return phi_v, phi_v * phi_v - 0.5 * c2_ / lam
+
+def critical_points(params):
+    """
+    Nonzero critical points of V for many parameter sets at once.
+
+    `params` has shape (M, 3) with rows (λ, c3, c2); returns shape (M, 2)
+    with the root nearer φ = 0 first. For c2/λ > 0 that is (barrier,
+    minimum); for c2/λ < 0 both are minima on either side of a maximum at
+    φ = 0. Rows without two distinct real roots (9c3² ≤ 32λc2, which
+    includes the double root at 9c3² = 32λc2) come back as NaN.
+
+    The roots of 4λφ² - 3c3·φ + 2c2 sit at φv ± √disc/(8λ) around the
+    vertex φv = 3c3/(8λ), so [φv - w, φv] and [φv, φv + w] with
+    w = 2·√disc/(8λ) bracket one each. SciPy's elementwise (Chandrupatla)
+    solver refines every bracket in one vectorized call; on SciPy < 1.15
+    this falls back to a loop of brentq.
+    """
+    lam, c3_, c2_ = np.asarray(params, dtype=float).T
+    phi_v, half_width2 = _vertex(lam, c3_, c2_)
+    real = half_width2 > 0
+    width = np.where(real, 2 * np.sqrt(np.abs(half_width2)), 1.0)
+
+    def quad(phi, lam, c3_, c2_):
+        return (4 * lam * phi - 3 * c3_) * phi + 2 * c2_
+
+    lower = np.full_like(phi_v, np.nan)
+    upper = np.full_like(phi_v, np.nan)
+    if elementwise is not None:
+        args = (lam[real], c3_[real], c2_[real])
+        v, w = phi_v[real], width[real]
+        lower[real] = elementwise.find_root(quad, (v - w, v), args=args).x
+        upper[real] = elementwise.find_root(quad, (v, v + w), args=args).x
+    else:
+        for i in np.flatnonzero(real):
+            args = (lam[i], c3_[i], c2_[i])
+            lower[i] = brentq(quad, phi_v[i] - width[i], phi_v[i], args=args)
+            upper[i] = brentq(quad, phi_v[i], phi_v[i] + width[i], args=args)
+    return _near_far(lower, upper)
+
+def critical_points_eig(params):
+    """
+    Bracket-free version of critical_points, with the same output layout
+    (root nearer φ = 0 first, NaN for rows without two distinct real
+    roots).
+
+    Stacks the 2x2 companion matrix of φ² - (3c3/4λ)·φ + c2/(2λ) for every
+    row and solves them all with one batched np.linalg.eigvals call, i.e.
+    np.roots with a leading batch axis. Every row is a true quadratic
+    (λ ≠ 0), so no degree trimming is needed.
+    """
+    lam, c3_, c2_ = np.asarray(params, dtype=float).T
+    companion = np.zeros((lam.shape[0], 2, 2))
+    companion[:, 0, 0] = 0.75 * c3_ / lam
+    companion[:, 0, 1] = -0.5 * c2_ / lam
+    companion[:, 1, 0] = 1.0
+    r = np.linalg.eigvals(companion).real
+    # same real-and-distinct test as critical_points, so a double root (or a
+    # complex pair) is NaN in both rather than depending on eigvals rounding
+    real = _vertex(lam, c3_, c2_)[1] > 0
+    r = np.where(real[:, None], r, np.nan)
+    return _near_far(r[:, 0], r[:, 1])
+
+# The same roots for a sweep over c3 (first row is the potential above)
+c3_sweep = np.linspace(c3, 0.55, 5)
+params_sweep = np.column_stack([np.full_like(c3_sweep, lambda_coeff),
+                                c3_sweep,
+                                np.full_like(c3_sweep, c2)])
+roots_sweep = critical_points(params_sweep)
+print("\nBatched root-finding over c₃ (barrier, minimum):")
+for c3_i, (phi_b, phi_m) in zip(c3_sweep, roots_sweep):
+    print(f"c₃ = {c3_i:.3f}: φ₂ = {phi_b:.4f}, φ₃ = {phi_m:.4f}")
+roots_eig = critical_points_eig(params_sweep)
+print(f"Companion-matrix roots agree to {np.nanmax(np.abs(roots_eig - roots_sweep)):.1e}")
+
 print("\nIdentification:")
-if V_min1 > V_min3:
-    print(f"φ = {phi_min1:.4f} is METASTABLE (higher energy)")
-    print(f"φ = {phi_min3:.4f} is STABLE (lower energy)")
-    phi_stable = phi_min3
-    phi_metastable = phi_min1
-else:
-    print(f"φ = {phi_min3:.4f} is METASTABLE (higher energy)")
-    print(f"φ = {phi_min1:.4f} is STABLE (lower energy)")
-    phi_stable = phi_min1
-    phi_metastable = phi_min3
+# The higher of the two minima is metastable; pick it by index rather than
+# branching, a pattern that carries straight over to parameter sweeps
+candidates = np.array([phi_min1, phi_min3])
+meta_idx = int(np.argmax([V_min1, V_min3]))
+phi_metastable = float(candidates[meta_idx])
+phi_stable = float(candidates[1 - meta_idx])
+print(f"φ = {phi_metastable:.4f} is METASTABLE (higher energy)")
+print(f"φ = {phi_stable:.4f} is STABLE (lower energy)")
 
 # =============================================================================
 # Part 4: Create the SingleFieldInstanton Object
@@ -149,9 +353,9 @@ print(f"Metastable minimum (where we tunnel FROM): φ = {phi_metastable:.4f}")
 instanton_higgs = SingleFieldInstanton(
     phi_absMin=phi_stable,        # Stable minimum
     phi_metaMin=phi_metastable,   # Metastable minimum
-    V=V_higgs,                    # Potential function
-    dV=dV_higgs,                  # First derivative
-    d2V=d2V_higgs                 # Second derivative (optional but improves accuracy)
+    V=V_solver,                   # Potential function
+    dV=dV_solver,                 # First derivative
+    d2V=d2V_solver                # Second derivative (optional but improves accuracy)
 )
 
 print("\n✓ SingleFieldInstanton object created successfully!")
@@ -183,33 +387,58 @@ print("\n" + "=" * 70)
 print("PART 6: VISUALIZING THE BUBBLE PROFILE")
 print("=" * 70)
 
-plt.figure(figsize=(10, 6))
-
 # Plot the bubble profile (R vs Phi)
-plt.plot(profile_higgs.R, profile_higgs.Phi, 'b-', linewidth=2.5, label='φ(r) instanton profile')
+ax2.plot(profile_higgs.R, profile_higgs.Phi, 'b-', linewidth=2.5, label='φ(r) instanton profile')
 
 # Add reference lines for the minima
-plt.axhline(y=phi_metastable, color='r', linestyle='--', alpha=0.5, linewidth=2, 
+ax2.axhline(y=phi_metastable, color='r', linestyle='--', alpha=0.5, linewidth=2, 
             label=f'Metastable min (φ = {phi_metastable:.2f})')
-plt.axhline(y=phi_stable, color='g', linestyle='--', alpha=0.5, linewidth=2, 
+ax2.axhline(y=phi_stable, color='g', linestyle='--', alpha=0.5, linewidth=2, 
             label=f'Stable min (φ = {phi_stable:.2f})')
 
-plt.xlabel(r'Radius $r$', fontsize=14)
-plt.ylabel(r'Field $\phi(r)$', fontsize=14)
-plt.title('Higgs Bubble Profile', fontsize=16)
-plt.legend(fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.show()
+ax2.set_xlabel(r'Radius $r$', fontsize=14)
+ax2.set_ylabel(r'Field $\phi(r)$', fontsize=14)
+ax2.set_title('Higgs Bubble Profile', fontsize=16)
+ax2.legend(fontsize=12)
+ax2.grid(True, alpha=0.3)
 
-print("\nInterpretation:")
+print("\nInterpretation (right panel):")
 print("- At the CENTER (r = 0): field is in the stable vacuum")
 print("- At LARGE r: field approaches the metastable vacuum")
 print("- The WALL is where the transition occurs (steepest slope)")
 
+if HAVE_NUMBA:
+    @njit(cache=CACHE_JIT)
+    def find_wall(R, Phi):
+        """
+        Index and radius of the steepest point of the profile.
+
+        Takes the central difference |dφ/dr| at each interior point and
+        keeps a running maximum, so R and Phi are read in a single pass
+        with no gradient array in between.
+        """
+        best = 0.0
+        idx = 0
+        for i in range(1, R.shape[0] - 1):
+            d = abs((Phi[i + 1] - Phi[i - 1]) / (R[i + 1] - R[i - 1]))
+            if d > best:
+                best = d
+                idx = i
+        return idx, R[idx]
+else:
+    def find_wall(R, Phi):
+        """Index and radius of the steepest point of the profile."""
+        # as a plain Python loop the kernel above would be slower than this
+        idx = int(np.argmax(np.abs(np.gradient(Phi, R))))
+        return idx, R[idx]
+
 # Find approximate wall location (where derivative is maximum)
-dphi_dr = np.gradient(profile_higgs.Phi, profile_higgs.R)
-wall_index = np.argmax(np.abs(dphi_dr))
-wall_radius = profile_higgs.R[wall_index]
+wall_index, wall_radius = find_wall(profile_higgs.R, profile_higgs.Phi)
 print(f"- Approximate wall location: r ≈ {wall_radius:.4f}")
 
-
+fig.tight_layout()
+if FIGURE_DIR:
+    os.makedirs(FIGURE_DIR, exist_ok=True)
+    fig.savefig(os.path.join(FIGURE_DIR, 'higgs_transition.png'))
+else:
+    plt.show()
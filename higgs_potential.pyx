@@ -0,0 +1,39 @@
+# cython: language_level=3
+# distutils: extra_compile_args = -O3 -ffast-math
+"""
+Cython port of the Higgs-like potential from Solution.py.
+
+Build in place with:
+
+    cythonize -i higgs_potential.pyx
+
+The functions take and return plain doubles. The instanton solver still
+calls them through the normal Python call protocol, but with less
+per-call overhead than numba's dispatcher. They do not accept arrays,
+so Solution.py only hands dV_higgs and d2V_higgs to the solver and
+keeps its own array-capable V_higgs (findAction() evaluates V on the
+whole profile).
+The coefficients are fixed at compile time and exported as PARAMS so
+Solution.py can check they still match its own before using them.
+"""
+
+cdef double LAMBDA = 0.25  # Quartic coupling
+cdef double C3 = 0.45      # Cubic coefficient
+cdef double C2 = 0.15      # Quadratic coefficient
+
+PARAMS = (LAMBDA, C3, C2)
+
+
+cpdef double V_higgs(double phi) noexcept nogil:
+    """V(φ) = λφ⁴ - c3·φ³ + c2·φ², in Horner form."""
+    return phi * phi * (phi * (LAMBDA * phi - C3) + C2)
+
+
+cpdef double dV_higgs(double phi) noexcept nogil:
+    """dV/dφ = 4λφ³ - 3c3·φ² + 2c2·φ, in Horner form."""
+    return phi * (phi * (4 * LAMBDA * phi - 3 * C3) + 2 * C2)
+
+
+cpdef double d2V_higgs(double phi) noexcept nogil:
+    """d²V/dφ² = 12λφ² - 6c3·φ + 2c2, in Horner form."""
+    return (12 * LAMBDA * phi - 6 * C3) * phi + 2 * C2